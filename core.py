@@ -10,6 +10,7 @@ import time
 import threading
 import logging
 import signal
+import json
 from datetime import datetime, timezone, timedelta
 from http.server import HTTPServer, BaseHTTPRequestHandler
 from typing import Optional, Dict, Any
@@ -29,6 +30,7 @@ NOVNC_PORT = int(os.getenv("NOVNC_PORT", "6080"))
 HEALTH_PORT = int(os.getenv("HEALTH_PORT", "6081"))
 BASE_TRADE_AMOUNT = float(os.getenv("BASE_TRADE_AMOUNT", "1.0"))
 MAX_MARTINGALE = int(os.getenv("MAX_MARTINGALE", "2"))
+TRADE_PAYOUT = float(os.getenv("TRADE_PAYOUT", "0.8"))  # Placeholder payout ratio for P&L
 
 # =========================
 # Logging Setup
@@ -86,6 +88,76 @@ except Exception as e:
     telegram_available = False
     logger.warning(f"[⚠️] Telegram libraries not available: {e}")
 
+# =========================
+# Trade Analytics
+# =========================
+from trade_analytics import TradeAnalytics
+analytics = TradeAnalytics()
+
+# =========================
+# TRADE TRACKING
+# =========================
+active_trade: Optional[Dict[str, Any]] = None
+trade_lock = threading.Lock()
+
+def open_trade(signal):
+    """Track a signal as the open trade until the result monitor closes it"""
+    global active_trade
+    with trade_lock:
+        if active_trade:
+            logger.warning(f"[⚠️] Trade on {active_trade['pair']} still open, ignoring {signal['currency_pair']}")
+            return
+        active_trade = {
+            "pair": signal["currency_pair"],
+            "direction": signal.get("direction") or "",
+            "amount": BASE_TRADE_AMOUNT,
+            "losses": 0.0,
+            "martingale_level": 0,
+        }
+
+def trade_result_callback(result):
+    """Apply a WIN/LOSS from the result monitor; records the trade once its martingale sequence closes"""
+    global active_trade
+    with trade_lock:
+        trade = active_trade
+        if not trade:
+            logger.info(f"[📊] Result {result} without a tracked trade")
+            return
+        if result == "WIN":
+            pnl = trade["amount"] * TRADE_PAYOUT - trade["losses"]
+        elif trade["martingale_level"] < MAX_MARTINGALE:
+            trade["losses"] += trade["amount"]
+            trade["amount"] *= 2
+            trade["martingale_level"] += 1
+            logger.info(f"[🎲] Martingale level {trade['martingale_level']} on {trade['pair']}: ${trade['amount']}")
+            return
+        else:
+            pnl = -(trade["losses"] + trade["amount"])
+        active_trade = None
+
+    analytics.record_trade(trade["pair"], trade["direction"], result, pnl,
+                           trade["martingale_level"], channel=TELEGRAM_CHANNEL)
+
+# =========================
+# BROWSER AUTOMATION
+# =========================
+browser = None  # BrowserManager, once the trading browser is started
+
+def start_browser():
+    global browser
+    try:
+        from selenium_integration import BrowserManager
+    except Exception as e:
+        logger.error(f"[❌] Selenium integration not available: {e}")
+        return
+
+    manager = BrowserManager()
+    if not manager.setup_driver():
+        return
+    browser = manager
+    if manager.wait_for_login():
+        manager.start_result_monitor(trade_result_callback)
+
 # =========================
 # TRADING LOGIC PLACEHOLDER
 # =========================
@@ -102,9 +174,15 @@ def trading_loop():
 # =========================
 def signal_callback(signal):
     logger.info(f"[⚡] Signal received: {signal}")
+    open_trade(signal)
 
 def command_callback(command):
     logger.info(f"[💻] Command received: {command}")
+    # Commands may be addressed to the bot as /stats@<botname>
+    if command.split()[0].split("@")[0].lower() == "/stats":
+        return analytics.format_summary()
+
+telegram_service = None
 
 def start_telegram_listener(signal_callback, command_callback):
     if not telegram_available:
@@ -114,7 +192,9 @@ def start_telegram_listener(signal_callback, command_callback):
     from telegram_integration import TelegramService  # Assuming your file structure
 
     async def run_service():
+        global telegram_service
         service = TelegramService()
+        telegram_service = service
         if await service.initialize():
             service.setup_handlers(signal_callback, command_callback)
             await service.run()
@@ -129,10 +209,27 @@ def start_telegram_listener(signal_callback, command_callback):
 # =========================
 class HealthHandler(BaseHTTPRequestHandler):
     def do_GET(self):
+        path = self.path.rstrip("/")
+        if path == "/stats":
+            self._send_json(analytics.snapshot())
+            return
+        if path == "/assets":
+            self._send_json(browser.get_asset_switch_stats() if browser else {"switches": 0})
+            return
+        if path == "/telegram":
+            self._send_json(telegram_service.get_status() if telegram_service else {"connected": False})
+            return
         self.send_response(200)
         self.end_headers()
         self.wfile.write(b"OK")
 
+    def _send_json(self, data):
+        body = json.dumps(data).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body)
+
 def start_health_server():
     httpd = HTTPServer(("0.0.0.0", HEALTH_PORT), HealthHandler)
     threading.Thread(target=httpd.serve_forever, daemon=True).start()
@@ -144,13 +241,17 @@ def start_health_server():
 def main():
     logger.info("Starting Pocket Option Trading Bot...")
 
-    # 1. Start health server (background)
+    # 1. Start health server and trade analytics (background)
     start_health_server()
+    analytics.start()
 
     # 2. Start Telegram listener (background)
     threading.Thread(target=start_telegram_listener, args=(signal_callback, command_callback), daemon=True).start()
 
-    # 3. Start trading logic (main thread)
+    # 3. Start browser automation and result monitoring (background)
+    threading.Thread(target=start_browser, daemon=True).start()
+
+    # 4. Start trading logic (main thread)
     trading_loop()
 
 if __name__ == "__main__":
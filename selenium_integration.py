@@ -5,6 +5,7 @@ Includes trade result detection and browser management
 """
 
 import os
+import re
 import time
 import threading
 import logging
@@ -17,11 +18,151 @@ logger = logging.getLogger(__name__)
 CHECK_INTERVAL = 0.5  # Check trade results every 0.5 seconds
 DRIVER_PATH = "/usr/local/bin/chromedriver"
 CHROME_PROFILE_PATH = "/home/dockuser/chrome-profile"
+ASSET_INDEX_TTL = 600  # Rebuild asset index after 10 minutes
+ASSET_INDEX_RETRY = 60  # Wait before retrying a failed index build
+ASSET_SEARCH_TIMEOUT = 3  # Wait for filtered asset list after searching
+ASSET_SELECT_TIMEOUT_MS = 3000  # Wait for the asset list/category to render when selecting
+ASSET_TAB_SETTLE_MS = 500  # Wait for each category tab to render while indexing
+
+# Asset selectors (adjust based on actual UI)
+CURRENT_ASSET_SELECTORS = [
+    ".asset-select .current-asset",
+    ".selected-asset",
+    "[data-testid='current-asset']",
+    ".asset-name"
+]
+ASSET_PICKER_SELECTORS = [
+    ".asset-select",
+    ".current-symbol",
+    "[data-testid='asset-select']",
+    ".pair-number-wrap"
+]
+ASSET_TAB_SELECTORS = [
+    ".assets-block__nav-item",
+    ".asset-categories .category-tab",
+    "[data-testid='asset-category']"
+]
+ASSET_ITEM_SELECTORS = [
+    ".assets-block__alist .alist__item",
+    ".asset-list .asset-item",
+    "[data-testid='asset-item']"
+]
+ASSET_SEARCH_SELECTORS = [
+    ".asset-search input",
+    "input.search__field",
+    "[data-testid='asset-search'] input"
+]
+
+# Browser-side helpers: each runs in a single driver round trip instead of
+# one find_element per selector (which blocks on the implicit wait when absent).
+# Labels use the first line of the element text, dropping payout/percent rows.
+_FIRST_VISIBLE_TEXT_JS = """
+for (const sel of arguments[0]) {
+    for (const el of document.querySelectorAll(sel)) {
+        if (el.getClientRects().length) return el.innerText.split('\\n')[0].trim();
+    }
+}
+return null;
+"""
+_CLICK_ASSET_ITEM_JS = """
+const targets = arguments[1];
+let best = null, bestLabel = null, bestRank = targets.length;
+for (const sel of arguments[0]) {
+    for (const el of document.querySelectorAll(sel)) {
+        if (!el.getClientRects().length) continue;
+        const label = el.innerText.split('\\n')[0].trim();
+        const rank = targets.indexOf(label.toUpperCase().replace(/[^A-Z0-9]/g, ''));
+        if (rank !== -1 && rank < bestRank) { best = el; bestLabel = label; bestRank = rank; }
+    }
+}
+if (best) { best.click(); return bestLabel; }
+return null;
+"""
+_FIND_SEARCH_INPUT_JS = """
+for (const sel of arguments[0]) {
+    for (const el of document.querySelectorAll(sel)) {
+        if (el.getClientRects().length) return el;
+    }
+}
+return null;
+"""
+
+# Asynchronous helpers (execute_async_script): the last argument is the completion
+# callback, so the browser can wait for the asset list to render without extra round trips.
+_ASYNC_ASSET_HELPERS = """
+const done = arguments[arguments.length - 1];
+const visible = el => el.getClientRects().length > 0;
+const query = sels => sels.flatMap(sel => Array.from(document.querySelectorAll(sel))).filter(visible);
+const labelOf = el => el.innerText.split('\\n')[0].trim();
+const sleep = ms => new Promise(resolve => setTimeout(resolve, ms));
+const openPicker = (pickerSelectors, itemSelectors) => {
+    if (query(itemSelectors).length) return true;
+    const picker = query(pickerSelectors)[0];
+    if (picker) picker.click();
+    return !!picker;
+};
+"""
+# Open the picker and collect [label, tab index] for every category tab
+_INDEX_ASSETS_JS = _ASYNC_ASSET_HELPERS + """
+const [pickerSelectors, tabSelectors, itemSelectors, settleMs] = arguments;
+const labels = () => [...new Set(query(itemSelectors).map(labelOf).filter(Boolean))];
+const settle = async previous => {
+    const end = Date.now() + settleMs;
+    while (Date.now() < end) {
+        const current = labels();
+        if (current.length && current.join('|') !== previous) return current;
+        await sleep(50);
+    }
+    return labels();
+};
+(async () => {
+    if (!openPicker(pickerSelectors, itemSelectors)) return done(null);
+    let current = await settle('');
+    const tabs = query(tabSelectors);
+    if (!tabs.length) return done(current.map(label => [label, null]));
+    const entries = [];
+    for (let i = 0; i < tabs.length; i++) {
+        tabs[i].click();
+        current = await settle(current.join('|'));
+        for (const label of current) entries.push([label, i]);
+    }
+    done(entries);
+})();
+"""
+# Open the picker, switch to the entry's category tab and click the best-ranked target
+_SELECT_ASSET_JS = _ASYNC_ASSET_HELPERS + """
+const [pickerSelectors, tabSelectors, tabIndex, itemSelectors, targets, timeoutMs] = arguments;
+const findItem = () => {
+    let best = null, bestRank = targets.length;
+    for (const el of query(itemSelectors)) {
+        const rank = targets.indexOf(labelOf(el).toUpperCase().replace(/[^A-Z0-9]/g, ''));
+        if (rank !== -1 && rank < bestRank) { best = el; bestRank = rank; }
+    }
+    return best;
+};
+(async () => {
+    if (!openPicker(pickerSelectors, itemSelectors)) return done(null);
+    let tabClicked = tabIndex === null;
+    const end = Date.now() + timeoutMs;
+    while (Date.now() < end) {
+        const item = findItem();
+        if (item) { const label = labelOf(item); item.click(); return done(label); }
+        if (!tabClicked) {
+            const tab = query(tabSelectors)[tabIndex];
+            if (tab) { tab.click(); tabClicked = true; }
+        }
+        await sleep(50);
+    }
+    done(null);
+})();
+"""
 
 # Try to import Selenium
 try:
     from selenium import webdriver
     from selenium.webdriver.common.by import By
+    from selenium.webdriver.common.keys import Keys
+    from selenium.webdriver.common.action_chains import ActionChains
     from selenium.webdriver.chrome.service import Service
     from selenium.webdriver.chrome.options import Options
     from selenium.webdriver.support.ui import WebDriverWait
@@ -44,6 +185,7 @@ class BrowserManager:
         self.headless = headless
         self.is_initialized = False
         self.monitoring_active = False
+        self.asset_navigator = None
         
     def setup_driver(self) -> Optional[webdriver.Chrome]:
         """Initialize Chrome WebDriver with optimized settings"""
@@ -153,12 +295,14 @@ class BrowserManager:
                 # If no login elements and trading elements present, login successful
                 if not login_elements and trading_elements:
                     logger.info("[✅] Login completed successfully")
+                    self.refresh_asset_index()
                     return True
                 
                 # Check URL for trading page
                 current_url = self.driver.current_url.lower()
                 if "trade" in current_url or "trading" in current_url:
                     logger.info("[✅] Login completed (URL check)")
+                    self.refresh_asset_index()
                     return True
                 
                 time.sleep(2)
@@ -248,6 +392,8 @@ class BrowserManager:
                         callback(result)
                         last_result = result
                         
+                    # Keep the asset index fresh so signals never pay for a rebuild
+                    self.refresh_asset_index()
                     time.sleep(CHECK_INTERVAL)
                     
                 except Exception as e:
@@ -269,27 +415,41 @@ class BrowserManager:
             return None
             
         try:
-            asset_selectors = [
-                ".asset-select .current-asset",
-                ".selected-asset",
-                "[data-testid='current-asset']",
-                ".asset-name"
-            ]
-            
-            for selector in asset_selectors:
-                try:
-                    element = self.driver.find_element(By.CSS_SELECTOR, selector)
-                    if element.is_displayed():
-                        return element.text.strip()
-                except:
-                    continue
-                    
-            return None
-            
+            return self.driver.execute_script(_FIRST_VISIBLE_TEXT_JS, CURRENT_ASSET_SELECTORS)
         except Exception as e:
             logger.error(f"[❌] Error getting current asset: {e}")
             return None
     
+    def switch_asset(self, pair: str) -> bool:
+        """Switch the trading interface to the asset named in a signal"""
+        if not self.driver:
+            return False
+            
+        return self._get_asset_navigator().switch_to(pair)
+    
+    def refresh_asset_index(self) -> int:
+        """Build or refresh the asset index outside of signal handling"""
+        if not self.driver:
+            return 0
+            
+        return self._get_asset_navigator().refresh_index()
+    
+    def get_asset_switch_stats(self) -> Dict[str, Any]:
+        """Asset switch latency and counters for health reporting"""
+        navigator = self.asset_navigator
+        if not navigator:
+            return {"switches": 0, "indexed_assets": 0}
+        return {
+            **navigator.stats,
+            "indexed_assets": len(navigator.index),
+            "index_age": time.time() - navigator.index_built_at if navigator.index else None,
+        }
+    
+    def _get_asset_navigator(self) -> "AssetNavigator":
+        if not self.asset_navigator or self.asset_navigator.driver is not self.driver:
+            self.asset_navigator = AssetNavigator(self.driver)
+        return self.asset_navigator
+    
     def set_trade_amount(self, amount: float) -> bool:
         """Set trade amount in the interface"""
         if not self.driver:
@@ -353,6 +513,181 @@ class BrowserManager:
                 self.is_initialized = False
 
 
+def normalize_pair(name: str) -> str:
+    """Normalize an asset name for lookups, e.g. 'eur/usd otc' -> 'EURUSDOTC'"""
+    return re.sub(r"[^A-Z0-9]", "", name.upper())
+
+
+def _pair_candidates(pair: str) -> list:
+    """Lookup keys for a signal pair, preferring the regular market over OTC"""
+    key = normalize_pair(pair)
+    if key.endswith("OTC"):
+        return [key]
+    return [key, f"{key}OTC"]
+
+
+def _search_query(label: str) -> str:
+    """Search by the base pair so both regular and OTC entries are listed"""
+    return re.sub(r"\s*OTC$", "", label, flags=re.IGNORECASE)
+
+
+class AssetNavigator:
+    """
+    Switches the selected asset with as few driver calls as possible
+    Indexes normalized pair names to asset list labels and their category tab
+    """
+    
+    def __init__(self, driver):
+        self.driver = driver
+        self.index: Dict[str, Dict[str, Any]] = {}
+        self.index_built_at = 0.0
+        self.stats = {
+            "switches": 0,
+            "skipped": 0,
+            "failures": 0,
+            "last_latency": None,
+            "avg_latency": None,
+        }
+        self._total_latency = 0.0
+        self._index_attempted_at = 0.0
+        # Index walks and switches both drive the asset picker
+        self._lock = threading.Lock()
+        
+    def index_is_fresh(self) -> bool:
+        return bool(self.index) and time.time() - self.index_built_at < ASSET_INDEX_TTL
+    
+    def refresh_index(self) -> int:
+        """
+        Rebuild a stale index off the signal path (after login, from the monitor thread)
+        Never waits for an in-progress switch; returns the number of indexed entries
+        """
+        if self.index_is_fresh() or time.time() - self._index_attempted_at < ASSET_INDEX_RETRY:
+            return 0
+        if not self._lock.acquire(blocking=False):
+            return 0
+        try:
+            self._index_attempted_at = time.time()
+            return self.build_index()
+        except Exception as e:
+            logger.error(f"[❌] Error building asset index: {e}")
+            return 0
+        finally:
+            self._lock.release()
+    
+    def build_index(self) -> int:
+        """
+        Index every asset list entry by normalized name and category tab
+        Walks the category tabs once, so later switches can jump straight to an entry
+        """
+        entries = self.driver.execute_async_script(
+            _INDEX_ASSETS_JS, ASSET_PICKER_SELECTORS, ASSET_TAB_SELECTORS,
+            ASSET_ITEM_SELECTORS, ASSET_TAB_SETTLE_MS
+        ) or []
+        self._close_picker()
+            
+        index = {}
+        for label, category in entries:
+            key = normalize_pair(label)
+            if key and key not in index:
+                index[key] = {"label": label, "category": category}
+                
+        if index:
+            self.index = index
+            self.index_built_at = time.time()
+            logger.info(f"[🗂️] Asset index built with {len(index)} entries")
+        return len(index)
+    
+    def resolve(self, pair: str) -> Optional[Dict[str, Any]]:
+        """Return the index entry for a signal pair, if known"""
+        for key in _pair_candidates(pair):
+            entry = self.index.get(key)
+            if entry:
+                return entry
+        return None
+    
+    def _targets(self, pair: str) -> list:
+        """Normalized labels to select, in order of preference"""
+        entry = self.resolve(pair)
+        return [normalize_pair(entry["label"])] if entry else _pair_candidates(pair)
+    
+    def switch_to(self, pair: str) -> bool:
+        """
+        Select the asset for a signal pair
+        Skips the switch when it is already selected; records switch latency
+        A missing or stale index is never rebuilt here: unknown entries use search
+        """
+        with self._lock:
+            return self._switch_to(pair)
+    
+    def _switch_to(self, pair: str) -> bool:
+        started = time.monotonic()
+        
+        try:
+            # Only the preferred target counts as selected: EUR/USD OTC does not satisfy EUR/USD
+            # while the regular market is listed
+            current = self.driver.execute_script(_FIRST_VISIBLE_TEXT_JS, CURRENT_ASSET_SELECTORS)
+            if current and normalize_pair(current) == self._targets(pair)[0]:
+                self.stats["skipped"] += 1
+                logger.info(f"[🎯] Asset {current} already selected")
+                return True
+                
+            entry = self.resolve(pair)
+            targets = self._targets(pair)
+            clicked = self.driver.execute_async_script(
+                _SELECT_ASSET_JS, ASSET_PICKER_SELECTORS, ASSET_TAB_SELECTORS,
+                entry["category"] if entry else None, ASSET_ITEM_SELECTORS, targets,
+                ASSET_SELECT_TIMEOUT_MS
+            )
+            
+            if not clicked:
+                clicked = self._search_and_click(_search_query(entry["label"] if entry else pair), targets)
+                if clicked and self.index:
+                    self.index.setdefault(normalize_pair(clicked), {"label": clicked, "category": None})
+                    
+            if not clicked:
+                logger.warning(f"[⚠️] Asset {pair} not found in asset list")
+                self._close_picker()
+                self.stats["failures"] += 1
+                return False
+                
+            self._record_latency(time.monotonic() - started)
+            logger.info(f"[🔀] Switched asset to {clicked} in {self.stats['last_latency']:.2f}s")
+            return True
+            
+        except Exception as e:
+            logger.error(f"[❌] Error switching asset to {pair}: {e}")
+            self._close_picker()
+            self.stats["failures"] += 1
+            return False
+    
+    def _search_and_click(self, query: str, targets: list) -> Optional[str]:
+        """Entry not rendered (virtualized or other tab): narrow the list via search"""
+        search_input = self.driver.execute_script(_FIND_SEARCH_INPUT_JS, ASSET_SEARCH_SELECTORS)
+        if not search_input:
+            return None
+            
+        # Select-all then type, so framework-controlled inputs see the change
+        search_input.send_keys(Keys.CONTROL, "a", Keys.NULL, query)
+        try:
+            return WebDriverWait(self.driver, ASSET_SEARCH_TIMEOUT, poll_frequency=0.1).until(
+                lambda driver: driver.execute_script(_CLICK_ASSET_ITEM_JS, ASSET_ITEM_SELECTORS, targets)
+            )
+        except TimeoutException:
+            return None
+    
+    def _close_picker(self):
+        try:
+            ActionChains(self.driver).send_keys(Keys.ESCAPE).perform()
+        except Exception as e:
+            logger.debug(f"[⚠️] Could not close asset picker: {e}")
+    
+    def _record_latency(self, latency: float):
+        self.stats["switches"] += 1
+        self._total_latency += latency
+        self.stats["last_latency"] = latency
+        self.stats["avg_latency"] = self._total_latency / self.stats["switches"]
+
+
 # Legacy compatibility functions
 def setup_driver(headless: bool = False) -> Optional[webdriver.Chrome]:
     """Legacy function for backward compatibility"""
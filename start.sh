@@ -2,7 +2,7 @@
 set -e
 
 # Setup
-mkdir -p /home/dockuser/.vnc /home/dockuser/chrome-profile
+mkdir -p /home/dockuser/.vnc /home/dockuser/chrome-profile /home/dockuser/.telegram
 chmod 700 /home/dockuser/.vnc
 
 # Create xstartup
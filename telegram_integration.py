@@ -6,8 +6,13 @@ Designed to work seamlessly with the core trading bot
 
 import os
 import re
+import json
+import time
+import asyncio
+import inspect
 import logging
-from datetime import datetime
+from collections import deque
+from datetime import datetime, timezone
 from typing import Dict, Any, Optional, Callable
 
 # Setup logging
@@ -20,90 +25,353 @@ API_HASH = os.getenv("TELEGRAM_API_HASH", "8e12421a95fd722246e0c0b194fd3e0c")
 BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN", "8477806088:AAGEXpIAwN5tNQM0hsCGqP-otpLJjPJLmWA")
 CHANNEL_ID = os.getenv("TELEGRAM_CHANNEL", "-1003033183667")
 
+# Session and reconnect tuning
+# TELEGRAM_SESSION_DIR holds the session and entity cache; keep it on a persistent
+# volume (see the Zeabur template) so restarts skip login and channel resolution
+SESSION_DIR = os.getenv("TELEGRAM_SESSION_DIR", "/home/dockuser/.telegram")
+SESSION_PATH = os.path.join(SESSION_DIR, "bot_session")
+ENTITY_CACHE_PATH = os.path.join(SESSION_DIR, "entity_cache.json")
+CONNECTION_RETRIES = int(os.getenv("TELEGRAM_CONNECTION_RETRIES", "3"))
+RETRY_DELAY = float(os.getenv("TELEGRAM_RETRY_DELAY", "0.5"))
+RECONNECT_MAX_DELAY = 30.0  # Upper bound for reconnect backoff (seconds)
+WATCHDOG_INTERVAL = 1.0  # Connection state poll interval (seconds)
+CATCH_UP_LIMIT = int(os.getenv("TELEGRAM_CATCH_UP_LIMIT", "100"))  # Ids per request (Telegram max 100)
+CATCH_UP_MAX_AGE = int(os.getenv("TELEGRAM_CATCH_UP_MAX_AGE", "300"))  # Skip older missed messages
+SEEN_MESSAGES_LIMIT = 1000
+
 # Try to import Telegram libraries
 try:
-    from telethon import TelegramClient, events
+    from telethon import TelegramClient, events, utils
+    from telethon.tl.types import InputPeerChannel
     TELEGRAM_AVAILABLE = True
     logger.info("[✅] Telethon imported successfully")
 except ImportError as e:
     TELEGRAM_AVAILABLE = False
     logger.warning(f"[⚠️] Telethon not available: {e}")
 
+if TELEGRAM_AVAILABLE:
+    class ReconnectAwareClient(TelegramClient):
+        """
+        TelegramClient that reports Telethon's internal auto-reconnects
+        Telethon 1.28 does not catch up after reconnecting, so the service hooks in here
+        """
+
+        # Called before updates resume; returns the catch-up coroutine to await afterwards
+        on_reconnected: Optional[Callable] = None
+
+        async def _handle_auto_reconnect(self):
+            catch_up = self.on_reconnected() if self.on_reconnected else None
+            await super()._handle_auto_reconnect()
+            if catch_up:
+                await catch_up
+
+
 class TelegramService:
     def __init__(self):
         self.client = None
         self.channel_entity = None
+        self.channel_peer_id = None
         self.is_connected = False
+        self.last_message_id = 0
+        self.resume_from_id = 0
+        self.signal_callback = None
+        self.command_callback = None
+        self.metrics: Dict[str, Any] = {
+            "time_to_ready": None,
+            "time_to_catch_up": None,
+            "time_to_first_signal": None,
+            "reconnects": 0,
+            "replayed_messages": 0,
+            "duplicate_messages": 0,
+        }
+        self._seen_ids = set()
+        self._seen_order = deque()
+        self._restart_started_at = None
+        self._awaiting_first_message = False
+        self._state = self._load_state()
 
     async def initialize(self) -> bool:
         if not TELEGRAM_AVAILABLE:
             logger.error("[❌] Telegram libraries not available")
             return False
 
+        self._mark_restart()
         try:
-            self.client = TelegramClient('bot_session', API_ID, API_HASH)
+            os.makedirs(SESSION_DIR, exist_ok=True)
+            self.client = ReconnectAwareClient(
+                SESSION_PATH,
+                API_ID,
+                API_HASH,
+                connection_retries=CONNECTION_RETRIES,
+                retry_delay=RETRY_DELAY,
+                auto_reconnect=True,
+                catch_up=False,
+            )
+            self.client.on_reconnected = self._on_reconnected
             await self.client.start(bot_token=BOT_TOKEN)
             logger.info("[✅] Telegram client connected")
             await self._resolve_channel()
             self.is_connected = True
+            self.metrics["time_to_ready"] = time.monotonic() - self._restart_started_at
+            logger.info(f"[⏱️] Telegram ready in {self.metrics['time_to_ready']:.2f}s")
             return True
         except Exception as e:
             logger.error(f"[❌] Failed to initialize Telegram: {e}")
             return False
 
     async def _resolve_channel(self):
+        cached = self._state.get("channel")
+        if cached and cached.get("key") == CHANNEL_ID:
+            self.channel_entity = InputPeerChannel(cached["channel_id"], cached["access_hash"])
+            self.channel_peer_id = utils.get_peer_id(self.channel_entity)
+            self.last_message_id = self._state.get("last_message_id", 0)
+            self.resume_from_id = self.last_message_id
+            logger.info(f"[✅] Resolved channel from cache: {cached.get('title', CHANNEL_ID)}")
+            return
+
         try:
             if CHANNEL_ID.startswith("-100") or CHANNEL_ID.lstrip("-").isdigit():
                 self.channel_entity = await self.client.get_entity(int(CHANNEL_ID))
             else:
                 self.channel_entity = await self.client.get_entity(CHANNEL_ID)
 
+            self.channel_peer_id = utils.get_peer_id(self.channel_entity)
             channel_name = getattr(self.channel_entity, 'title', CHANNEL_ID)
             logger.info(f"[✅] Resolved channel: {channel_name}")
         except Exception as e:
             logger.error(f"[❌] Failed to resolve channel '{CHANNEL_ID}': {e}")
             raise
 
+        self._state = {}
+        input_peer = utils.get_input_peer(self.channel_entity)
+        if isinstance(input_peer, InputPeerChannel):
+            self._state = {
+                "channel": {
+                    "key": CHANNEL_ID,
+                    "channel_id": input_peer.channel_id,
+                    "access_hash": input_peer.access_hash,
+                    "title": channel_name,
+                },
+                "last_message_id": 0,
+            }
+            self._save_state()
+
+    def _load_state(self) -> Dict[str, Any]:
+        """Load persisted channel entity and last seen message id"""
+        try:
+            with open(ENTITY_CACHE_PATH) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"[⚠️] Ignoring unreadable entity cache: {e}")
+            return {}
+
+    def _save_state(self):
+        """Atomically persist channel entity and last seen message id"""
+        if not self._state:
+            return
+        try:
+            tmp_path = f"{ENTITY_CACHE_PATH}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(self._state, f)
+            os.replace(tmp_path, ENTITY_CACHE_PATH)
+        except Exception as e:
+            logger.warning(f"[⚠️] Failed to persist entity cache: {e}")
+
+    def _mark_seen(self, message_id: int, persist: bool = True) -> bool:
+        """
+        Record a message id; returns False if it was already processed
+        Catch-up passes persist=False and saves the cursor once per batch
+        """
+        if message_id in self._seen_ids:
+            self.metrics["duplicate_messages"] += 1
+            return False
+        self._seen_ids.add(message_id)
+        self._seen_order.append(message_id)
+        if len(self._seen_order) > SEEN_MESSAGES_LIMIT:
+            self._seen_ids.discard(self._seen_order.popleft())
+
+        if message_id > self.last_message_id:
+            self.last_message_id = message_id
+            if persist:
+                self._persist_cursor()
+        return True
+
+    def _persist_cursor(self):
+        if self._state and self._state.get("last_message_id") != self.last_message_id:
+            self._state["last_message_id"] = self.last_message_id
+            self._save_state()
+
+    def _on_reconnected(self):
+        """Called after Telethon transparently re-established the connection"""
+        logger.info("[🔄] Telegram connection restored, catching up...")
+        self.metrics["reconnects"] += 1
+        self._mark_restart()
+        return self._catch_up(self.last_message_id)
+
+    async def _catch_up(self, from_id: int):
+        """
+        Replay channel messages after from_id that were missed while disconnected
+        Bots cannot read history, so missed ids are fetched directly. Live messages
+        keep advancing last_message_id meanwhile, so batches follow a local cursor.
+        """
+        if not self.channel_entity or not from_id:
+            return
+
+        cutoff = datetime.now(timezone.utc).timestamp() - CATCH_UP_MAX_AGE
+        cursor = from_id
+        replayed = 0
+        while True:
+            ids = list(range(cursor + 1, cursor + 1 + CATCH_UP_LIMIT))
+            cursor = ids[-1]
+            try:
+                messages = await self.client.get_messages(self.channel_entity, ids=ids)
+            except Exception as e:
+                logger.warning(f"[⚠️] Catch-up failed: {e}")
+                break
+
+            messages = [m for m in messages if m is not None]
+            if not messages:
+                # A whole batch of deleted ids: keep going while live messages prove newer ones exist
+                if cursor < self.last_message_id:
+                    continue
+                logger.info(f"[🔁] Catch-up stopped at id {cursor}: no messages in ids {ids[0]}-{cursor}")
+                break
+
+            for message in sorted(messages, key=lambda m: m.id):
+                if message.date and message.date.timestamp() < cutoff:
+                    self._mark_seen(message.id, persist=False)
+                    continue
+                if await self._handle_message(message, persist=False):
+                    replayed += 1
+            self._persist_cursor()
+
+        self.metrics["replayed_messages"] += replayed
+        if self._restart_started_at is not None:
+            self.metrics["time_to_catch_up"] = time.monotonic() - self._restart_started_at
+        if replayed:
+            logger.info(f"[🔁] Replayed {replayed} missed message(s)")
+
+    async def _handle_message(self, message, persist: bool = True) -> bool:
+        """Dispatch a channel message once; returns False for duplicates"""
+        if not self._mark_seen(message.id, persist):
+            return False
+
+        self._record_first_message()
+        message_text = message.message or ""
+        if message_text.startswith("/"):
+            logger.info(f"[💻] Command detected: {message_text}")
+            try:
+                reply = await _invoke(self.command_callback, message_text)
+                if isinstance(reply, str) and reply:
+                    await self.client.send_message(self.channel_entity, reply)
+            except Exception as e:
+                logger.error(f"[❌] Error processing command '{message_text}': {e}")
+        else:
+            signal = parse_trading_signal(message_text)
+            if signal and signal.get('currency_pair') and signal.get('entry_time'):
+                logger.info(
+                    f"[⚡] Signal parsed: currency={signal['currency_pair']}, "
+                    f"direction={signal.get('direction')}, entry_time={signal['entry_time']}"
+                )
+                await _invoke(self.signal_callback, signal)
+            else:
+                logger.warning(f"[⚠️] Invalid or incomplete signal: {message_text}")
+        return True
+
+    def _mark_restart(self):
+        self._restart_started_at = time.monotonic()
+        self._awaiting_first_message = True
+
+    def _record_first_message(self):
+        """Latency from (re)connect to the first dispatched message, replayed or live"""
+        if not self._awaiting_first_message:
+            return
+        self._awaiting_first_message = False
+        elapsed = time.monotonic() - self._restart_started_at
+        self.metrics["time_to_first_signal"] = elapsed
+        logger.info(f"[⏱️] Time to first signal: {elapsed:.2f}s")
+
     def setup_handlers(self, signal_callback: Callable, command_callback: Callable):
         if not self.client:
             logger.error("[❌] Client not initialized")
             return
 
+        self.signal_callback = signal_callback
+        self.command_callback = command_callback
+
         @self.client.on(events.NewMessage())
         async def message_handler(event):
             try:
                 logger.info(f"[📩] Message received: {event.message.message}")
-                target_id = getattr(self.channel_entity, 'id', None)
-                if event.chat_id != target_id:
+                if event.chat_id != self.channel_peer_id:
                     return
-
-                message_text = event.message.message
-
-                if message_text.startswith("/"):
-                    logger.info(f"[💻] Command detected: {message_text}")
-                    try:
-                        await command_callback(message_text)
-                    except Exception as e:
-                        logger.error(f"[❌] Error processing command '{message_text}': {e}")
-                else:
-                    signal = parse_trading_signal(message_text)
-                    if signal and signal.get('currency_pair') and signal.get('entry_time'):
-                        logger.info(
-                            f"[⚡] Signal parsed: currency={signal['currency_pair']}, "
-                            f"direction={signal.get('direction')}, entry_time={signal['entry_time']}"
-                        )
-                        await signal_callback(signal)
-                    else:
-                        logger.warning(f"[⚠️] Invalid or incomplete signal: {message_text}")
+                await self._handle_message(event.message)
             except Exception as e:
                 logger.exception(f"[❌] Error in message handler: {e}")
 
-    async def run(self, signal_callback: Callable, command_callback: Callable):
-        initialized = await self.initialize()
-        if initialized:
+    async def _reconnect(self):
+        """Re-establish a dropped connection with exponential backoff"""
+        delay = RETRY_DELAY
+        while True:
+            try:
+                self._mark_restart()
+                await self.client.connect()
+                if not await self.client.is_user_authorized():
+                    await self.client.start(bot_token=BOT_TOKEN)
+                self.is_connected = True
+                self.metrics["reconnects"] += 1
+                logger.info("[🔄] Telegram client reconnected")
+                return
+            except Exception as e:
+                logger.warning(f"[⚠️] Reconnect failed, retrying in {delay:.1f}s: {e}")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+    async def run(self, signal_callback: Optional[Callable] = None, command_callback: Optional[Callable] = None):
+        if signal_callback or command_callback:
+            if not await self.initialize():
+                return
             self.setup_handlers(signal_callback, command_callback)
-            logger.info("[🚀] Telegram service is running...")
-            await self.client.run_until_disconnected()
+        if not self.client:
+            logger.error("[❌] Client not initialized")
+            return
+
+        logger.info("[🚀] Telegram service is running...")
+        await self._catch_up(self.resume_from_id)
+        while True:
+            try:
+                await self.client.run_until_disconnected()
+            except (ConnectionError, OSError) as e:
+                # Telethon re-raises once its own reconnect attempts run out
+                logger.warning(f"[⚠️] Telegram connection lost: {e}")
+            except Exception as e:
+                logger.exception(f"[❌] Telegram update loop failed: {e}")
+            self.is_connected = False
+            resume_from_id = self.last_message_id
+            logger.warning("[⚠️] Telegram disconnected, reconnecting...")
+            await self._reconnect()
+            await self._catch_up(resume_from_id)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Connection and latency metrics for health reporting"""
+        return {
+            "connected": self.is_connected,
+            "last_message_id": self.last_message_id,
+            **self.metrics,
+        }
+
+
+async def _invoke(callback: Optional[Callable], *args):
+    """Call a sync or async callback"""
+    if callback is None:
+        return None
+    result = callback(*args)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
 
 def parse_trading_signal(message: str) -> Optional[Dict[str, Any]]:
     """
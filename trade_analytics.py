@@ -0,0 +1,285 @@
+"""
+Trade Analytics Module
+Keeps incremental trade statistics for the health server and /stats command
+Recomputes aggregates from the trade log with NumPy when available
+"""
+
+import os
+import csv
+import time
+import queue
+import threading
+import logging
+import warnings
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional
+
+# Setup logging
+logger = logging.getLogger(__name__)
+
+# Configuration
+TRADE_LOG_PATH = os.getenv("TRADE_LOG_PATH", "/home/dockuser/trades.csv")
+DIMENSIONS = ("channel", "pair", "hour", "direction")
+LOG_FIELDS = ("timestamp", "channel", "pair", "direction", "result", "pnl", "martingale_level")
+
+# NumPy is optional (see requirements.txt); only bulk recomputation uses it
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+    # Strings load as objects (fixed-width unicode would silently truncate long names)
+    _LOG_DTYPE = [
+        ("timestamp", "f8"), ("channel", "O"), ("pair", "O"), ("direction", "O"),
+        ("result", "O"), ("pnl", "f8"), ("martingale_level", "i8")
+    ]
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+
+def _new_bucket() -> Dict[str, Any]:
+    return {"trades": 0, "wins": 0, "pnl": 0.0, "max_martingale": 0}
+
+
+def _hour_key(timestamp: float) -> str:
+    return f"{datetime.fromtimestamp(timestamp, timezone.utc).hour:02d}"
+
+
+class TradeAnalytics:
+    """
+    Aggregates closed trades by channel, pair, hour (UTC) and direction
+    record_trade() is O(1); log writes happen on a background thread
+    """
+
+    def __init__(self, log_path: str = TRADE_LOG_PATH):
+        self.log_path = log_path
+        self.totals = _new_bucket()
+        self.martingale_depths: Dict[int, int] = {}
+        self.groups: Dict[str, Dict[str, Dict[str, Any]]] = {dim: {} for dim in DIMENSIONS}
+        self.history_loaded = False
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._writer = None
+
+    def start(self):
+        """Load the trade log and start the background log writer"""
+        if self._writer:
+            return
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+
+    def record_trade(self, pair: str, direction: str, result: str, pnl: float,
+                     martingale_level: int = 0, channel: str = "unknown",
+                     timestamp: Optional[float] = None):
+        """Record a closed trade"""
+        timestamp = timestamp if timestamp is not None else time.time()
+        row = (timestamp, channel, pair.upper(), direction.upper(), result.upper(),
+               float(pnl), int(martingale_level))
+        keys = {
+            "channel": channel,
+            "pair": row[2],
+            "hour": _hour_key(timestamp),
+            "direction": row[3],
+        }
+        win = row[4] == "WIN"
+
+        with self._lock:
+            self._apply(self.totals, 1, int(win), row[5], row[6])
+            self.martingale_depths[row[6]] = self.martingale_depths.get(row[6], 0) + 1
+            for dim, key in keys.items():
+                bucket = self.groups[dim].setdefault(key, _new_bucket())
+                self._apply(bucket, 1, int(win), row[5], row[6])
+
+        self._queue.put(row)
+
+    @staticmethod
+    def _apply(bucket: Dict[str, Any], trades: int, wins: int, pnl: float, max_martingale: int):
+        bucket["trades"] += trades
+        bucket["wins"] += wins
+        bucket["pnl"] += pnl
+        if max_martingale > bucket["max_martingale"]:
+            bucket["max_martingale"] = max_martingale
+
+    def load_history(self) -> int:
+        """Aggregate the trade log and merge it into the live statistics"""
+        columns = self._read_log()
+        count = len(columns["timestamp"])
+        if not count:
+            self.history_loaded = True
+            return 0
+
+        started = time.monotonic()
+        if NUMPY_AVAILABLE:
+            totals, depths, groups = _aggregate_vectorized(columns)
+        else:
+            totals, depths, groups = _aggregate_rows(columns)
+
+        with self._lock:
+            self._apply(self.totals, totals["trades"], totals["wins"], totals["pnl"], totals["max_martingale"])
+            for level, n in depths.items():
+                self.martingale_depths[level] = self.martingale_depths.get(level, 0) + n
+            for dim, buckets in groups.items():
+                for key, agg in buckets.items():
+                    bucket = self.groups[dim].setdefault(key, _new_bucket())
+                    self._apply(bucket, agg["trades"], agg["wins"], agg["pnl"], agg["max_martingale"])
+            self.history_loaded = True
+
+        logger.info(f"[📈] Loaded {count} historical trades in {time.monotonic() - started:.2f}s")
+        return count
+
+    def _read_log(self) -> Dict[str, Any]:
+        if NUMPY_AVAILABLE:
+            try:
+                # Column-wise parse in C; an empty log only triggers a "no data" warning
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", UserWarning)
+                    data = np.loadtxt(self.log_path, delimiter=",", skiprows=1, dtype=_LOG_DTYPE,
+                                      quotechar='"', ndmin=1, encoding="utf-8")
+                # astype(str) sizes each string column to its longest value for fast np.unique
+                return {field: data[field].astype(str) if data[field].dtype == object else data[field]
+                        for field in LOG_FIELDS}
+            except FileNotFoundError:
+                return {field: [] for field in LOG_FIELDS}
+            except ValueError as e:
+                logger.warning(f"[⚠️] Malformed trade log rows, parsing row by row: {e}")
+
+        columns = {field: [] for field in LOG_FIELDS}
+        try:
+            with open(self.log_path, newline="") as f:
+                reader = csv.reader(f)
+                next(reader, None)  # header
+                for row in reader:
+                    if len(row) != len(LOG_FIELDS):
+                        continue
+                    try:
+                        values = (float(row[0]), row[1], row[2], row[3], row[4], float(row[5]), int(row[6]))
+                    except ValueError:
+                        continue
+                    for field, value in zip(LOG_FIELDS, values):
+                        columns[field].append(value)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.error(f"[❌] Failed to read trade log: {e}")
+        return columns
+
+    def _writer_loop(self):
+        # History is loaded before draining the queue so queued trades are not counted twice
+        try:
+            self.load_history()
+        except Exception as e:
+            logger.error(f"[❌] Failed to load trade history: {e}")
+
+        while True:
+            rows = [self._queue.get()]
+            while not self._queue.empty():
+                rows.append(self._queue.get_nowait())
+            try:
+                log_dir = os.path.dirname(self.log_path)
+                if log_dir:
+                    os.makedirs(log_dir, exist_ok=True)
+                new_file = not os.path.exists(self.log_path)
+                with open(self.log_path, "a", newline="") as f:
+                    writer = csv.writer(f)
+                    if new_file:
+                        writer.writerow(LOG_FIELDS)
+                    writer.writerows(rows)
+            except Exception as e:
+                logger.error(f"[❌] Failed to write trade log: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Copy of the current statistics with win rates"""
+        with self._lock:
+            totals = dict(self.totals)
+            depths = dict(self.martingale_depths)
+            groups = {dim: {key: dict(b) for key, b in buckets.items()}
+                      for dim, buckets in self.groups.items()}
+            history_loaded = self.history_loaded
+
+        for bucket in [totals] + [b for buckets in groups.values() for b in buckets.values()]:
+            bucket["win_rate"] = bucket["wins"] / bucket["trades"] if bucket["trades"] else None
+        return {
+            "history_loaded": history_loaded,
+            "totals": totals,
+            "martingale_depths": {str(level): n for level, n in sorted(depths.items())},
+            **groups,
+        }
+
+    def format_summary(self, top: int = 5) -> str:
+        """Short text summary for the /stats command"""
+        stats = self.snapshot()
+        totals = stats["totals"]
+        if not totals["trades"]:
+            return "📊 No trades recorded yet"
+
+        lines = [
+            f"📊 Trades: {totals['trades']} | Win rate: {totals['win_rate']:.1%} | P&L: {totals['pnl']:+.2f}",
+            "🎲 Martingale depth: " + ", ".join(f"{level}: {n}" for level, n in stats["martingale_depths"].items()),
+        ]
+        for dim in ("pair", "direction", "channel"):
+            ranked = sorted(stats[dim].items(), key=lambda item: item[1]["pnl"], reverse=True)[:top]
+            lines.append(f"{dim.capitalize()}: " + ", ".join(
+                f"{key} {b['win_rate']:.0%} ({b['pnl']:+.2f})" for key, b in ranked
+            ))
+        return "\n".join(lines)
+
+
+def _aggregate_vectorized(columns: Dict[str, list]):
+    """Group-by aggregation over the whole log using NumPy"""
+    timestamps = np.asarray(columns["timestamp"], dtype=np.float64)
+    wins = np.asarray(columns["result"]) == "WIN"
+    pnl = np.asarray(columns["pnl"], dtype=np.float64)
+    depth = np.asarray(columns["martingale_level"], dtype=np.int64)
+
+    totals = {
+        "trades": int(len(pnl)),
+        "wins": int(wins.sum()),
+        "pnl": float(pnl.sum()),
+        "max_martingale": int(depth.max()),
+    }
+    depth_counts = np.bincount(np.clip(depth, 0, None))
+    depths = {level: int(n) for level, n in enumerate(depth_counts) if n}
+
+    keys = {
+        "channel": np.asarray(columns["channel"]),
+        "pair": np.asarray(columns["pair"]),
+        "hour": (timestamps // 3600 % 24).astype(np.int64),
+        "direction": np.asarray(columns["direction"]),
+    }
+    groups = {}
+    for dim, values in keys.items():
+        uniq, inverse = np.unique(values, return_inverse=True)
+        size = len(uniq)
+        trades = np.bincount(inverse, minlength=size)
+        win_counts = np.bincount(inverse, weights=wins, minlength=size)
+        pnl_sums = np.bincount(inverse, weights=pnl, minlength=size)
+        max_depth = np.zeros(size, dtype=np.int64)
+        np.maximum.at(max_depth, inverse, depth)
+
+        buckets = {}
+        for i, key in enumerate(uniq):
+            key = f"{int(key):02d}" if dim == "hour" else str(key)
+            buckets[key] = {
+                "trades": int(trades[i]),
+                "wins": int(win_counts[i]),
+                "pnl": float(pnl_sums[i]),
+                "max_martingale": int(max_depth[i]),
+            }
+        groups[dim] = buckets
+    return totals, depths, groups
+
+
+def _aggregate_rows(columns: Dict[str, list]):
+    """Pure Python fallback for when NumPy is not installed"""
+    totals = _new_bucket()
+    depths: Dict[int, int] = {}
+    groups = {dim: {} for dim in DIMENSIONS}
+    rows = zip(columns["timestamp"], columns["channel"], columns["pair"], columns["direction"],
+               columns["result"], columns["pnl"], columns["martingale_level"])
+    for timestamp, channel, pair, direction, result, pnl, level in rows:
+        win = int(result == "WIN")
+        TradeAnalytics._apply(totals, 1, win, pnl, level)
+        depths[level] = depths.get(level, 0) + 1
+        keys = {"channel": channel, "pair": pair, "hour": _hour_key(timestamp), "direction": direction}
+        for dim, key in keys.items():
+            TradeAnalytics._apply(groups[dim].setdefault(key, _new_bucket()), 1, win, pnl, level)
+    return totals, depths, groups